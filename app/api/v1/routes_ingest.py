@@ -90,7 +90,8 @@ async def probe_source(
     except FileNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="source_not_found")
     except subprocess.CalledProcessError as exc:  # type: ignore[name-defined]
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=exc.stderr) from exc
+        stderr = exc.stderr.decode(errors="replace") if isinstance(exc.stderr, bytes) else exc.stderr
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=stderr) from exc
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except NotImplementedError as exc:
@@ -49,6 +49,8 @@ class Settings(BaseSettings):
         default="sqlite+aiosqlite:///./heimdex.db",
         description="SQLAlchemy compatible DSN.",
     )
+    db_pool_size: int = Field(default=5, description="Persistent connections kept per engine.")
+    db_max_overflow: int = Field(default=10, description="Extra connections allowed above db_pool_size under load.")
     redis_url: str = Field(
         default="redis://localhost:6379/0",
         description="Redis URL for background jobs.",
@@ -70,13 +72,17 @@ class Settings(BaseSettings):
 
     idempotency_ttl_seconds: int = Field(default=24 * 3600, description="TTL for stored idempotency keys.")
 
-    job_queue_backend: Literal["immediate", "inline", "rq", "gcp_tasks"] = Field(
+    job_queue_backend: Literal["immediate", "inline", "noop", "rq", "gcp_tasks"] = Field(
         default="immediate",
-        description="Backend for async jobs (inline executes inline; rq schedules via Redis).",
+        description="Backend for async jobs (inline executes inline; noop marks jobs succeeded without running them; rq schedules via Redis).",
     )
     job_max_retries: int = Field(default=3, description="Maximum retry attempts for failed jobs.")
     job_retry_backoff_base: float = Field(default=2.0, description="Backoff multiplier between retries.")
     job_retry_initial_delay_s: float = Field(default=1.0, description="Initial delay before the first retry.")
+    thread_pool_size: int = Field(
+        default=64,
+        description="Per-process thread count for blocking work offloaded from the event loop.",
+    )
 
     allow_http_source_schemes: tuple[str, ...] = Field(
         default=("file", "s3", "gs"),
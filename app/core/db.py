@@ -3,8 +3,10 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Callable
 
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import StaticPool
 
 from .config import Settings
 
@@ -13,8 +15,26 @@ class Base(DeclarativeBase):
     """Declarative base for SQLAlchemy models."""
 
 
+def _is_sqlite_memory(url: URL) -> bool:
+    if url.get_backend_name() != "sqlite":
+        return False
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
 def create_engine(settings: Settings) -> AsyncEngine:
-    return create_async_engine(settings.database_url, echo=False, future=True)
+    url = make_url(settings.database_url)
+    if _is_sqlite_memory(url):
+        # An in-memory database lives only as long as its connection, so every
+        # session of this engine must share the one connection.
+        return create_async_engine(url, echo=False, future=True, poolclass=StaticPool)
+    return create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=True,
+    )
 
 
 def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
@@ -25,6 +25,15 @@ class ImmediateJobBackend(BaseJobBackend):
         await asyncio.to_thread(run_job, job_id)
 
 
+class NoopJobBackend(BaseJobBackend):
+    """Records jobs as succeeded without doing the work; for tests that only check scheduling."""
+
+    async def enqueue(self, job_id: str, job_type: JobType) -> None:
+        from app.workers.tasks import skip_job
+
+        await asyncio.to_thread(skip_job, job_id)
+
+
 class RQJobBackend(BaseJobBackend):
     def __init__(self, queue: Queue):
         self.queue = queue
@@ -41,6 +50,8 @@ def get_job_backend() -> BaseJobBackend:
     backend = settings.normalized_job_backend
     if backend == "immediate":
         return ImmediateJobBackend()
+    if backend == "noop":
+        return NoopJobBackend()
     if backend == "rq":  # pragma: no cover - requires redis
         connection = Redis.from_url(settings.redis_url)
         return RQJobBackend(Queue("heimdex-jobs", connection=connection))
@@ -49,4 +60,4 @@ def get_job_backend() -> BaseJobBackend:
     raise ValueError(f"Unsupported job backend: {settings.job_queue_backend}")
 
 
-__all__ = ["BaseJobBackend", "ImmediateJobBackend", "RQJobBackend", "get_job_backend"]
+__all__ = ["BaseJobBackend", "ImmediateJobBackend", "NoopJobBackend", "RQJobBackend", "get_job_backend"]
@@ -21,7 +21,9 @@ def configure_logging(level: int = logging.INFO) -> None:
 
 
 def get_logger(**initial_values: Any) -> structlog.BoundLogger:
-    return structlog.get_logger().bind(**initial_values)
+    # A lazy proxy: safe to create at import time, before configure_logging runs,
+    # and cached on first use so module-level loggers cost nothing per call.
+    return structlog.get_logger(**initial_values)
 
 
 __all__ = ["configure_logging", "get_logger"]
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import atexit
 import os
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 from urllib.parse import urlparse
+from uuid import uuid4
 
 from .config import Settings
 
@@ -23,6 +26,66 @@ class PresignedURL:
     headers: dict[str, str] | None = None
 
 
+# Files written atomically since the last barrier. Their data and the renames
+# that published them are fsynced together by flush_pending_writes rather than
+# on every write.
+_DIRTY_FILES: set[str] = set()
+_DIRTY_FILES_LOCK = threading.Lock()
+
+
+def atomic_write_bytes(path: Path, payload: bytes, *, durable: bool = True) -> Path:
+    """Write ``payload`` so readers see either the old file or the complete new one.
+
+    Data goes to a uniquely named sibling and is moved over ``path`` with
+    ``os.replace``. Durability is batched: the file and its parent directory are
+    fsynced by the next ``flush_pending_writes`` call, not per call. Pass
+    ``durable=False`` for disposable files (caches) that need atomicity only.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as handle:
+            handle.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if durable:
+        with _DIRTY_FILES_LOCK:
+            _DIRTY_FILES.add(str(path))
+    return path
+
+
+def _fsync_path(path: str) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@atexit.register
+def flush_pending_writes() -> None:
+    """Make every atomic write since the last call durable: file data first, then the directory entries.
+
+    Runs at interpreter exit and after each job (see ``app.workers.tasks.run_job``);
+    the latter matters because RQ's forked work horses leave via ``os._exit``,
+    which skips atexit handlers.
+    """
+    with _DIRTY_FILES_LOCK:
+        files = list(_DIRTY_FILES)
+        _DIRTY_FILES.clear()
+    for file_path in files:
+        _fsync_path(file_path)
+    for directory in {os.path.dirname(file_path) for file_path in files}:
+        _fsync_path(directory)
+
+
 class Storage(ABC):
     @abstractmethod
     def exists(self, uri: str) -> bool: ...
@@ -77,15 +140,11 @@ class LocalStorage(Storage):
         return self._resolve(uri).read_text(encoding="utf-8")
 
     def write_text(self, uri: str, payload: str) -> str:
-        path = self._resolve(uri)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(payload, encoding="utf-8")
-        return path.as_uri()
+        return self.write_bytes(uri, payload.encode("utf-8"))
 
     def write_bytes(self, uri: str, payload: bytes) -> str:
         path = self._resolve(uri)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_bytes(payload)
+        atomic_write_bytes(path, payload)
         return path.as_uri()
 
     def list(self, prefix: str) -> Iterable[str]:
@@ -165,4 +224,6 @@ __all__ = [
     "StorageStat",
     "PresignedURL",
     "get_storage",
+    "atomic_write_bytes",
+    "flush_pending_writes",
 ]
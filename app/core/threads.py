@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio.to_thread
+
+
+def configure_thread_pool(size: int) -> None:
+    """Size the thread pools used for blocking work offloaded from the running event loop.
+
+    Sets both the loop's default executor (backing ``asyncio.to_thread``) and anyio's
+    default limiter (backing FastAPI's sync dependencies and ``run_in_threadpool``).
+    Both are scoped to the current event loop, so the limit applies per process:
+    every API worker and every job worker gets ``size`` threads of its own.
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=size, thread_name_prefix="heimdex"))
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
+
+
+__all__ = ["configure_thread_pool"]
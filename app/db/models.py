@@ -6,11 +6,14 @@ from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Index, Integer, String, UniqueConstraint, func
-from sqlalchemy.dialects.postgresql import BIGINT
+from sqlalchemy.dialects.postgresql import BIGINT, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
 
+# Binary, indexable jsonb on PostgreSQL; plain JSON elsewhere (e.g. SQLite in tests).
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 
 class AssetStatus(str, enum.Enum):
     queued = "queued"
@@ -36,7 +39,7 @@ class Organization(Base):
 
     org_id: Mapped[str] = mapped_column(String(64), primary_key=True)
     plan: Mapped[str | None] = mapped_column(String(32), nullable=True)
-    limits_jsonb: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    limits_jsonb: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     assets: Mapped[List["Asset"]] = relationship(back_populates="organization", cascade="all, delete-orphan")
@@ -59,7 +62,11 @@ class Asset(Base):
 
     organization: Mapped[Organization] = relationship(back_populates="assets")
     sidecar: Mapped[Optional["Sidecar"]] = relationship(back_populates="asset", uselist=False)
-    thumbnails: Mapped[List["Thumbnail"]] = relationship(back_populates="asset", cascade="all, delete-orphan")
+    thumbnails: Mapped[List["Thumbnail"]] = relationship(
+        back_populates="asset",
+        cascade="all, delete-orphan",
+        order_by="Thumbnail.idx",
+    )
 
 
 class Sidecar(Base):
@@ -96,17 +103,21 @@ class Job(Base):
     __tablename__ = "jobs"
     __table_args__ = (
         Index("ix_jobs_org_id_asset_id", "org_id", "asset_id"),
+        Index("ix_jobs_status_type_created", "status", "job_type", "created_at"),
         UniqueConstraint("org_id", "idempotency_key", name="uq_jobs_org_idempotency"),
     )
+    # Fetch server-generated timestamps in the INSERT/UPDATE round-trip (RETURNING)
+    # so callers never need a follow-up refresh.
+    __mapper_args__ = {"eager_defaults": True}
 
     job_id: Mapped[str] = mapped_column(String(64), primary_key=True)
     job_type: Mapped[JobType] = mapped_column(Enum(JobType), nullable=False)
     org_id: Mapped[str] = mapped_column(ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False)
     asset_id: Mapped[str | None] = mapped_column(ForeignKey("assets.asset_id", ondelete="SET NULL"), nullable=True)
     status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.queued, nullable=False)
-    payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    error: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    payload: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
+    result: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
+    error: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -122,7 +133,7 @@ class AuditEvent(Base):
     org_id: Mapped[str] = mapped_column(ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False)
     user_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
     action: Mapped[str] = mapped_column(String(128), nullable=False)
-    meta_jsonb: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    meta_jsonb: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 
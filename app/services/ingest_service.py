@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import contextlib
+import functools
+import hashlib
+import os
 import shutil
 import subprocess
 from datetime import datetime, timezone
@@ -10,15 +13,19 @@ from typing import Any
 from urllib.parse import urlparse
 from uuid import uuid4
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.core.config import Settings
 from app.core.jobs import get_job_backend
-from app.core.storage import PresignedURL, Storage
+from app.core.storage import PresignedURL, Storage, atomic_write_bytes
 from app.db.models import Asset, AssetStatus, Job, JobStatus, JobType, Organization, Sidecar, Thumbnail
 from app.domain import (
     AssetIdentity,
+    HashInfo,
     SourceContext,
     derive_local_asset_identity,
     export_schema,
@@ -28,21 +35,40 @@ from app.domain import (
 from app.core.logging import get_logger
 
 
+# Parsed probe results are memoised on disk under derived_root so the sidecar
+# and thumbnail jobs for one asset only hash and ffprobe the source once.
+PROBE_CACHE_DIRNAME = ".probe_cache"
+PROBE_CACHE_MAX_ENTRIES = 512
+
+# The sidecar schema only changes with the code, so each process exports it
+# once per destination rather than on every sidecar job.
+_EXPORTED_SCHEMA_PATHS: set[Path] = set()
+
+_LOG = get_logger(component="ingest_service")
+_JOB_LOG = get_logger()
+
+
 class IngestService:
     def __init__(self, settings: Settings, storage: Storage, session: AsyncSession):
         self.settings = settings
         self.storage = storage
         self.session = session
-        self.logger = get_logger(component="ingest_service")
-
-    async def ensure_org(self, org_id: str) -> Organization:
-        org = await self.session.get(Organization, org_id)
-        if org:
-            return org
-        org = Organization(org_id=org_id)
-        self.session.add(org)
-        await self.session.flush()
-        return org
+        self.logger = _LOG
+
+    async def ensure_org(self, org_id: str) -> None:
+        # Orgs already ensured on this session skip the database entirely.
+        known = self.session.info.setdefault("ensured_orgs", set())
+        if org_id in known:
+            return
+        if self.session.bind.dialect.name == "postgresql":
+            stmt = pg_insert(Organization).values(org_id=org_id).on_conflict_do_nothing(index_elements=["org_id"])
+            await self.session.execute(stmt)
+        # Elsewhere (SQLite) even a no-op INSERT takes the database write lock until
+        # commit, which would block inline jobs, so read first there.
+        elif await self.session.get(Organization, org_id) is None:
+            self.session.add(Organization(org_id=org_id))
+            await self.session.flush()
+        known.add(org_id)
 
     async def init_upload(self, *, org_id: str, source_name: str, content_type: str | None) -> dict[str, Any]:
         await self.ensure_org(org_id)
@@ -69,17 +95,20 @@ class IngestService:
         if parsed_uri.scheme == "gs":
             raise NotImplementedError("gcs_commit_not_implemented")
         path = self._resolve_local_path(source_uri)
-        if not path.exists():
-            raise FileNotFoundError(source_uri)
+        # One stat feeds both the identity and the row so the two cannot disagree.
+        try:
+            stat = await asyncio.to_thread(path.stat)
+        except FileNotFoundError:
+            raise FileNotFoundError(source_uri) from None
 
         identity = await asyncio.to_thread(
             derive_local_asset_identity,
             path,
             max_bytes_for_strong_hash=weak_threshold_bytes,
+            stat_result=stat,
         )
 
         asset = await self.session.get(Asset, identity.asset_id)
-        stat = path.stat()
         created_time = self._stat_birthtime(stat)
         modified_time = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
 
@@ -113,24 +142,59 @@ class IngestService:
             "status": asset.status.value,
         }
 
-    async def probe(self, *, org_id: str, source_uri: str, weak_threshold_bytes: int | None) -> dict[str, Any]:
+    async def probe(
+        self,
+        *,
+        org_id: str,
+        source_uri: str,
+        weak_threshold_bytes: int | None,
+        asset_id: str | None = None,
+    ) -> dict[str, Any]:
         await self.ensure_org(org_id)
         parsed_uri = urlparse(source_uri)
         if parsed_uri.scheme == "gs":
             raise NotImplementedError("gcs_probe_not_implemented")
         path = self._resolve_local_path(source_uri)
-        identity = await asyncio.to_thread(
-            derive_local_asset_identity,
-            path,
-            max_bytes_for_strong_hash=weak_threshold_bytes,
-        )
-        context = await asyncio.to_thread(
-            self._build_source_context,
-            path,
-            identity,
-        )
-        raw = await asyncio.to_thread(self._run_ffprobe, path)
+        # Resolve the real path once; both the cache key and the sidecar URI reuse it.
+        resolved, stat = await asyncio.to_thread(_resolve_and_stat, path)
+        cache_path = self._probe_cache_path(resolved, stat, weak_threshold_bytes)
+        cached = await asyncio.to_thread(_read_probe_cache, cache_path)
+        if cached is not None:
+            return cached
+
+        identity = await self._identity_from_asset(asset_id, org_id, resolved, stat) if asset_id else None
+        reused_identity = identity is not None
+        if identity is None:
+            # Hashing (GIL-free in hashlib) and ffprobe (a subprocess) are independent,
+            # so run them side by side.
+            tasks = (
+                asyncio.create_task(
+                    asyncio.to_thread(
+                        derive_local_asset_identity,
+                        path,
+                        max_bytes_for_strong_hash=weak_threshold_bytes,
+                        stat_result=stat,
+                    )
+                ),
+                asyncio.create_task(self._run_ffprobe(path)),
+            )
+            try:
+                identity, raw = await asyncio.gather(*tasks)
+            except BaseException:
+                # gather does not cancel the survivor when one side fails; cancelling
+                # the probe kills its ffprobe child, and awaiting both retrieves their errors.
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        else:
+            raw = await self._run_ffprobe(path)
+        context = self._build_source_context(path, identity, stat, resolved.as_uri())
         sidecar = parse_ffprobe_json(raw, context)
+        # An identity reused from the asset row was derived under the commit-time
+        # threshold, which the cache key does not capture; only cache fresh ones.
+        if not reused_identity:
+            await asyncio.to_thread(_write_probe_cache, cache_path, sidecar)
         return sidecar
 
     async def enqueue_job(
@@ -176,24 +240,25 @@ class IngestService:
         )
         self.session.add(job)
         await self.session.commit()
-        await self.session.refresh(job)
         return job
 
     async def get_job(self, job_id: str) -> Job | None:
         return await self.session.get(Job, job_id)
 
     async def get_asset_snapshot(self, *, org_id: str, asset_id: str) -> dict[str, Any] | None:
-        stmt = select(Asset).where(Asset.asset_id == asset_id, Asset.org_id == org_id)
+        stmt = (
+            select(Asset)
+            .where(Asset.asset_id == asset_id, Asset.org_id == org_id)
+            .options(joinedload(Asset.sidecar), selectinload(Asset.thumbnails))
+            .execution_options(populate_existing=True)
+        )
         result = await self.session.execute(stmt)
-        asset = result.scalar_one_or_none()
+        asset = result.unique().scalar_one_or_none()
         if not asset:
             return None
 
-        sidecar_stmt = select(Sidecar).where(Sidecar.asset_id == asset_id)
-        sidecar = (await self.session.execute(sidecar_stmt)).scalar_one_or_none()
-
-        thumbs_stmt = select(Thumbnail).where(Thumbnail.asset_id == asset_id).order_by(Thumbnail.idx)
-        thumbs = (await self.session.execute(thumbs_stmt)).scalars().all()
+        sidecar = asset.sidecar
+        thumbs = asset.thumbnails
 
         return {
             "asset_id": asset.asset_id,
@@ -228,6 +293,7 @@ class IngestService:
         schema_version: str,
         storage_key: str,
         etag: str | None,
+        commit: bool = True,
     ) -> Sidecar:
         sidecar = await self.session.get(Sidecar, asset_id)
         if sidecar is None:
@@ -243,7 +309,7 @@ class IngestService:
             sidecar.schema_version = schema_version
             sidecar.storage_key = storage_key
             sidecar.etag = etag
-        await self.session.commit()
+        await self._flush_or_commit(commit)
         return sidecar
 
     async def persist_thumbnails(
@@ -252,22 +318,26 @@ class IngestService:
         org_id: str,
         asset_id: str,
         thumbnails: list[dict[str, Any]],
+        commit: bool = True,
     ) -> None:
         await self.session.execute(
             Thumbnail.__table__.delete().where(Thumbnail.asset_id == asset_id)  # type: ignore[attr-defined]
         )
-        for entry in thumbnails:
-            thumb = Thumbnail(
-                asset_id=asset_id,
-                org_id=org_id,
-                idx=entry.get("idx", 0),
-                ts_ms=entry.get("ts_ms"),
-                storage_key=entry["storage_key"],
-                width=entry.get("width"),
-                height=entry.get("height"),
-            )
-            self.session.add(thumb)
-        await self.session.commit()
+        rows = [
+            {
+                "asset_id": asset_id,
+                "org_id": org_id,
+                "idx": entry.get("idx", 0),
+                "ts_ms": entry.get("ts_ms"),
+                "storage_key": entry["storage_key"],
+                "width": entry.get("width"),
+                "height": entry.get("height"),
+            }
+            for entry in thumbnails
+        ]
+        if rows:
+            await self.session.execute(insert(Thumbnail), rows)
+        await self._flush_or_commit(commit)
 
     async def update_job_status(
         self,
@@ -276,6 +346,7 @@ class IngestService:
         status: JobStatus,
         result: dict[str, Any] | None = None,
         error: dict[str, Any] | None = None,
+        commit: bool = True,
     ) -> Job:
         job = await self.session.get(Job, job_id)
         if not job:
@@ -287,11 +358,20 @@ class IngestService:
             job.started_at = datetime.now(timezone.utc)
         if status in {JobStatus.succeeded, JobStatus.failed}:
             job.finished_at = datetime.now(timezone.utc)
-        await self.session.commit()
-        await self.session.refresh(job)
+        await self._flush_or_commit(commit)
         return job
 
-    def _resolve_local_path(self, source_uri: str) -> Path:
+    async def _flush_or_commit(self, commit: bool) -> None:
+        # Job runners pass commit=False for intermediate writes and let the final
+        # status update commit the whole outcome in one transaction.
+        if commit:
+            await self.session.commit()
+        else:
+            await self.session.flush()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _resolve_local_path(source_uri: str) -> Path:
         parsed = urlparse(source_uri)
         if parsed.scheme not in {"file", ""}:
             raise ValueError(f"unsupported_uri_scheme:{parsed.scheme}")
@@ -299,6 +379,52 @@ class IngestService:
             return Path(parsed.path)
         return Path(source_uri)
 
+    async def _identity_from_asset(
+        self,
+        asset_id: str,
+        org_id: str,
+        resolved: Path,
+        stat: os.stat_result,
+    ) -> AssetIdentity | None:
+        """Reuse the identity recorded at commit time when the file is unchanged since.
+
+        Avoids re-reading the whole file for a content hash on every job. Returns None
+        (forcing a fresh derivation) unless the asset belongs to ``org_id``, was committed
+        from the same path, and its size/mtime still match.
+        """
+        asset = await self.session.get(Asset, asset_id)
+        if asset is None or not asset.hash or asset.modified_time is None or asset.org_id != org_id:
+            return None
+        # Size and mtime alone are not an identity: another file can share both.
+        try:
+            recorded_path = self._resolve_local_path(asset.source_uri)
+        except ValueError:
+            return None
+        if await asyncio.to_thread(recorded_path.resolve) != resolved:
+            return None
+        recorded_mtime = asset.modified_time
+        if recorded_mtime.tzinfo is None:
+            recorded_mtime = recorded_mtime.replace(tzinfo=timezone.utc)
+        if asset.size_bytes != stat.st_size or abs(recorded_mtime.timestamp() - stat.st_mtime) > 1e-3:
+            return None
+        if asset.asset_id.startswith("sha256:"):
+            algo = "sha256"
+        elif asset.asset_id.startswith("weak:"):
+            algo = "weak"
+        else:
+            return None
+        return AssetIdentity(
+            asset_id=asset.asset_id,
+            hash=HashInfo(algo=algo, value=asset.hash),
+            hash_quality=asset.hash_quality,  # type: ignore[arg-type]
+        )
+
+    def _probe_cache_path(self, resolved: Path, stat: os.stat_result, weak_threshold_bytes: int | None) -> Path:
+        # Any rewrite of the file changes size or mtime_ns, which invalidates the entry.
+        raw_key = f"{resolved}:{stat.st_size}:{stat.st_mtime_ns}:{weak_threshold_bytes}"
+        key = hashlib.sha1(raw_key.encode("utf-8"), usedforsecurity=False).hexdigest()
+        return Path(self.settings.derived_root) / PROBE_CACHE_DIRNAME / f"{key}.json"
+
     @staticmethod
     def _stat_birthtime(stat_result: Any) -> datetime | None:
         birth_time = getattr(stat_result, "st_birthtime", None)
@@ -307,7 +433,8 @@ class IngestService:
         return datetime.fromtimestamp(birth_time, tz=timezone.utc)
 
     @staticmethod
-    def _run_ffprobe(target: Path) -> dict[str, Any]:
+    async def _run_ffprobe(target: Path) -> dict[str, Any]:
+        # Runs as an asyncio subprocess so a long probe does not pin a default-executor thread.
         command = [
             "ffprobe",
             "-v",
@@ -318,23 +445,36 @@ class IngestService:
             "json",
             str(target),
         ]
-        proc = subprocess.run(
-            command,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-        return json.loads(proc.stdout)
-
-    def _build_source_context(self, media_path: Path, identity: AssetIdentity) -> SourceContext:
-        stat = media_path.stat()
+        try:
+            stdout, stderr = await proc.communicate()
+        except BaseException:
+            # Cancelled (client gone, request timeout): don't leave ffprobe running.
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            await proc.wait()
+            raise
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode or 1, command, output=stdout, stderr=stderr)
+        return orjson.loads(stdout)
+
+    def _build_source_context(
+        self,
+        media_path: Path,
+        identity: AssetIdentity,
+        stat: os.stat_result,
+        uri: str,
+    ) -> SourceContext:
         created_time = self._stat_birthtime(stat)
         modified_time = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
 
         return SourceContext(
             type="local",
-            uri=media_path.resolve().as_uri(),
+            uri=uri,
             filename=media_path.name,
             size_bytes=stat.st_size,
             asset_id=identity.asset_id,
@@ -345,8 +485,44 @@ class IngestService:
         )
 
 
+def _resolve_and_stat(path: Path) -> tuple[Path, os.stat_result]:
+    return path.resolve(), path.stat()
+
+
+def _read_probe_cache(cache_path: Path) -> dict[str, Any] | None:
+    try:
+        return orjson.loads(cache_path.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
+
+def _write_probe_cache(cache_path: Path, sidecar: dict[str, Any]) -> None:
+    # The cache is an optimisation: failing to write or trim it must never fail the probe.
+    cache_dir = cache_path.parent
+    try:
+        # Disposable: a lost entry just means one more ffprobe, so skip the fsync barrier.
+        atomic_write_bytes(cache_path, orjson.dumps(sidecar), durable=False)
+    except OSError as exc:
+        _LOG.warning("probe_cache_write_failed", path=str(cache_path), error=str(exc))
+        return
+
+    entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".json")]
+    if len(entries) <= PROBE_CACHE_MAX_ENTRIES:
+        return
+    # Concurrent writers evict from the same directory, so entries can vanish
+    # between the scan and the stat or unlink.
+    aged: list[tuple[int, str]] = []
+    for entry in entries:
+        with contextlib.suppress(FileNotFoundError):
+            aged.append((entry.stat().st_mtime_ns, entry.path))
+    aged.sort()
+    for _, entry_path in aged[: len(aged) - PROBE_CACHE_MAX_ENTRIES]:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(entry_path)
+
+
 async def process_thumbnails_job(job_id: str, session: AsyncSession, settings: Settings, storage: Storage) -> None:
-    logger = get_logger(job_id=job_id, job_type="thumbnails")
+    logger = _JOB_LOG.bind(job_id=job_id, job_type="thumbnails")
     job = await session.get(Job, job_id)
     if not job:
         logger.error("job_not_found")
@@ -360,25 +536,30 @@ async def process_thumbnails_job(job_id: str, session: AsyncSession, settings: S
     source_uri = payload["source_uri"]
 
     try:
-        sidecar = await service.probe(org_id=org_id, source_uri=source_uri, weak_threshold_bytes=payload.get("weak_threshold_bytes"))
+        sidecar = await service.probe(
+            org_id=org_id,
+            source_uri=source_uri,
+            weak_threshold_bytes=payload.get("weak_threshold_bytes"),
+            asset_id=asset_id,
+        )
         derived_root = Path(settings.derived_root) / org_id
         derived_root.mkdir(parents=True, exist_ok=True)
         source_path = service._resolve_local_path(source_uri)
         updated = await asyncio.to_thread(render_thumbnails, str(source_path), sidecar, derived_root)
         manifest = _normalise_thumbnail_manifest(updated, derived_root, org_id, asset_id)
-        await service.persist_thumbnails(org_id=org_id, asset_id=asset_id, thumbnails=manifest)
+        await service.persist_thumbnails(org_id=org_id, asset_id=asset_id, thumbnails=manifest, commit=False)
         asset = await service.session.get(Asset, asset_id)
         if asset:
             asset.status = AssetStatus.ready
-            await service.session.commit()
         await service.update_job_status(job_id, status=JobStatus.succeeded, result={"thumbnails": manifest})
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.exception("thumbnail_job_failed")
+        await session.rollback()
         await service.update_job_status(job_id, status=JobStatus.failed, error={"message": str(exc)})
 
 
 async def process_sidecar_job(job_id: str, session: AsyncSession, settings: Settings, storage: Storage) -> None:
-    logger = get_logger(job_id=job_id, job_type="sidecar")
+    logger = _JOB_LOG.bind(job_id=job_id, job_type="sidecar")
     job = await session.get(Job, job_id)
     if not job:
         logger.error("job_not_found")
@@ -392,23 +573,27 @@ async def process_sidecar_job(job_id: str, session: AsyncSession, settings: Sett
     source_uri = payload["source_uri"]
 
     try:
-        sidecar = await service.probe(org_id=org_id, source_uri=source_uri, weak_threshold_bytes=payload.get("weak_threshold_bytes"))
+        sidecar = await service.probe(
+            org_id=org_id,
+            source_uri=source_uri,
+            weak_threshold_bytes=payload.get("weak_threshold_bytes"),
+            asset_id=asset_id,
+        )
         derived_root = Path(settings.derived_root)
-        schemas_dir = derived_root / "schemas"
-        schemas_dir.mkdir(parents=True, exist_ok=True)
-        await asyncio.to_thread(export_schema, schemas_dir / "sidecar.schema.json")
+        schema_path = derived_root / "schemas" / "sidecar.schema.json"
+        if schema_path not in _EXPORTED_SCHEMA_PATHS:
+            await asyncio.to_thread(export_schema, schema_path)
+            _EXPORTED_SCHEMA_PATHS.add(schema_path)
 
         org_root = derived_root / org_id
         org_root.mkdir(parents=True, exist_ok=True)
         source_path = service._resolve_local_path(source_uri)
         updated = await asyncio.to_thread(render_thumbnails, str(source_path), sidecar, org_root)
         manifest = _normalise_thumbnail_manifest(updated, org_root, org_id, asset_id)
-        await service.persist_thumbnails(org_id=org_id, asset_id=asset_id, thumbnails=manifest)
+        await service.persist_thumbnails(org_id=org_id, asset_id=asset_id, thumbnails=manifest, commit=False)
 
-        sidecars_dir = org_root / "sidecars"
-        sidecars_dir.mkdir(parents=True, exist_ok=True)
-        sidecar_path = sidecars_dir / f"{asset_id}.vna.json"
-        sidecar_path.write_text(json.dumps(updated, indent=2, sort_keys=True), encoding="utf-8")
+        sidecar_path = org_root / "sidecars" / f"{asset_id}.vna.json"
+        atomic_write_bytes(sidecar_path, orjson.dumps(updated, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
 
         storage_key = f"sidecars/{asset_id}.vna.json"
         await service.persist_sidecar(
@@ -417,11 +602,11 @@ async def process_sidecar_job(job_id: str, session: AsyncSession, settings: Sett
             schema_version=updated["schema_version"],
             storage_key=storage_key,
             etag=None,
+            commit=False,
         )
         asset = await service.session.get(Asset, asset_id)
         if asset:
             asset.status = AssetStatus.ready
-            await service.session.commit()
         await service.update_job_status(
             job_id,
             status=JobStatus.succeeded,
@@ -432,9 +617,19 @@ async def process_sidecar_job(job_id: str, session: AsyncSession, settings: Sett
         )
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.exception("sidecar_job_failed")
+        await session.rollback()
         await service.update_job_status(job_id, status=JobStatus.failed, error={"message": str(exc)})
 
 
+def _discard_tree(path: Path) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    loop.run_in_executor(None, functools.partial(shutil.rmtree, path, ignore_errors=True))
+
+
 def _normalise_thumbnail_manifest(
     sidecar: dict[str, Any],
     org_root: Path,
@@ -450,41 +645,48 @@ def _normalise_thumbnail_manifest(
 
     if thumbs_root.exists():
         final_root.parent.mkdir(parents=True, exist_ok=True)
-        if final_root.exists():
-            shutil.rmtree(final_root)
-        shutil.move(str(thumbs_root), str(final_root))
+        same_device = os.stat(thumbs_root).st_dev == os.stat(final_root.parent).st_dev
+        if same_device:
+            # Two directory-entry renames; the previous thumbnails are unlinked off the hot path.
+            if final_root.exists():
+                stale_root = final_root.with_name(f"{final_root.name}.old-{uuid4().hex}")
+                os.rename(final_root, stale_root)
+                _discard_tree(stale_root)
+            os.rename(thumbs_root, final_root)
+        else:
+            if final_root.exists():
+                shutil.rmtree(final_root)
+            shutil.move(str(thumbs_root), str(final_root))
         thumbs_parent = org_root / "thumbs"
         if thumbs_parent.exists() and not any(thumbs_parent.iterdir()):
             thumbs_parent.rmdir()
 
     final_root.mkdir(parents=True, exist_ok=True)
+    # One directory listing instead of a Path allocation per thumbnail.
+    written = {entry.name for entry in os.scandir(final_root) if entry.is_file()}
+    key_prefix = f"{org_id}/{asset_id}/thumbs/"
 
+    entries: list[tuple[int, dict[str, Any]]] = []
     if poster and poster.get("path"):
-        poster_path = final_root / Path(poster["path"]).name
-        poster["path"] = f"{org_id}/{asset_id}/thumbs/{poster_path.name}"
-        poster_entry = {
-            "idx": 0,
-            "storage_key": poster["path"],
-            "width": poster.get("width_px"),
-            "height": poster.get("height_px"),
-            "ts_ms": int(poster.get("timestamp_s", 0) * 1000),
-        }
-        generated.append(poster_entry)
-
-    samples = manifest.get("samples", [])
-    for index, sample in enumerate(samples, start=1):
-        if not sample.get("path"):
+        entries.append((0, poster))
+    for index, sample in enumerate(manifest.get("samples", []), start=1):
+        if sample.get("path"):
+            entries.append((index, sample))
+
+    for index, thumb in entries:
+        name = thumb["path"].rpartition("/")[2]
+        if name not in written:
             continue
-        sample_path = final_root / Path(sample["path"]).name
-        sample["path"] = f"{org_id}/{asset_id}/thumbs/{sample_path.name}"
-        entry = {
-            "idx": index,
-            "storage_key": sample["path"],
-            "width": sample.get("width_px"),
-            "height": sample.get("height_px"),
-            "ts_ms": int(sample.get("timestamp_s", 0) * 1000),
-        }
-        generated.append(entry)
+        thumb["path"] = key_prefix + name
+        generated.append(
+            {
+                "idx": index,
+                "storage_key": thumb["path"],
+                "width": thumb.get("width_px"),
+                "height": thumb.get("height_px"),
+                "ts_ms": int(thumb.get("timestamp_s", 0) * 1000),
+            }
+        )
     return generated
 
 
@@ -1,14 +1,77 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import threading
 
-from app.core.config import get_settings
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import Settings, get_settings
 from app.core.db import create_engine, create_session_factory
 from app.core.logging import configure_logging
-from app.core.storage import get_storage
-from app.db.models import JobType
+from app.core.storage import flush_pending_writes, get_storage
+from app.core.threads import configure_thread_pool
+from app.db.models import JobStatus, JobType
 from app.services.ingest_service import IngestService, process_sidecar_job, process_thumbnails_job
 
+# All jobs in a worker process run on one long-lived event loop owned by a
+# background thread. Callers (the RQ work loop or the inline backend's threads)
+# submit to it and block on the result, so pooled connections and executor
+# threads stay warm between jobs instead of being rebuilt by asyncio.run.
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_THREAD: threading.Thread | None = None
+_LOOP_LOCK = threading.Lock()
+
+# Only touched from the loop thread. Keyed by DSN so a settings reload pointing
+# at another database replaces the engine.
+_ENGINE: tuple[str, AsyncEngine, async_sessionmaker[AsyncSession]] | None = None
+
+
+def _get_loop(settings: Settings) -> asyncio.AbstractEventLoop:
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="heimdex-job-loop", daemon=True)
+            thread.start()
+            asyncio.run_coroutine_threadsafe(_configure_loop(settings.thread_pool_size), loop).result()
+            _LOOP, _LOOP_THREAD = loop, thread
+        return _LOOP
+
+
+async def _configure_loop(thread_pool_size: int) -> None:
+    configure_thread_pool(thread_pool_size)
+
+
+async def _get_session_factory(settings: Settings) -> async_sessionmaker[AsyncSession]:
+    global _ENGINE
+    if _ENGINE is None or _ENGINE[0] != settings.database_url:
+        if _ENGINE is not None:
+            await _ENGINE[1].dispose()
+        engine = create_engine(settings)
+        _ENGINE = (settings.database_url, engine, create_session_factory(engine))
+    return _ENGINE[2]
+
+
+@atexit.register
+def _shutdown_loop() -> None:
+    global _LOOP, _LOOP_THREAD, _ENGINE
+    if _LOOP is None:
+        return
+
+    async def _dispose() -> None:
+        if _ENGINE is not None:
+            await _ENGINE[1].dispose()
+
+    try:
+        asyncio.run_coroutine_threadsafe(_dispose(), _LOOP).result(timeout=10)
+    finally:
+        _LOOP.call_soon_threadsafe(_LOOP.stop)
+        if _LOOP_THREAD is not None:
+            _LOOP_THREAD.join(timeout=10)
+        _LOOP.close()
+        _LOOP, _LOOP_THREAD, _ENGINE = None, None, None
+
 
 def run_job(job_id: str) -> None:
     """Entry-point executed by the job backend (RQ or inline)."""
@@ -17,10 +80,8 @@ def run_job(job_id: str) -> None:
     configure_logging()
     storage = get_storage(settings)
 
-    engine = create_engine(settings)
-    session_factory = create_session_factory(engine)
-
     async def _runner() -> None:
+        session_factory = await _get_session_factory(settings)
         async with session_factory() as session:
             service = IngestService(settings, storage, session)
             job = await service.get_job(job_id)
@@ -31,8 +92,30 @@ def run_job(job_id: str) -> None:
             elif job.job_type == JobType.sidecar:
                 await process_sidecar_job(job_id, session, settings, storage)
 
-    asyncio.run(_runner())
-    asyncio.run(engine.dispose())
+    try:
+        asyncio.run_coroutine_threadsafe(_runner(), _get_loop(settings)).result()
+    finally:
+        # RQ work horses exit with os._exit, skipping atexit, so make the job's
+        # sidecar and cache writes durable before returning.
+        flush_pending_writes()
+
+
+def skip_job(job_id: str) -> None:
+    """Entry-point for the noop backend: mark the job succeeded without running it."""
+
+    settings = get_settings()
+    storage = get_storage(settings)
+
+    async def _runner() -> None:
+        session_factory = await _get_session_factory(settings)
+        async with session_factory() as session:
+            service = IngestService(settings, storage, session)
+            try:
+                await service.update_job_status(job_id, status=JobStatus.succeeded)
+            except LookupError:
+                return
+
+    asyncio.run_coroutine_threadsafe(_runner(), _get_loop(settings)).result()
 
 
-__all__ = ["run_job"]
+__all__ = ["run_job", "skip_job"]
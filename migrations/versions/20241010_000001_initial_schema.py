@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
 
 
 revision = "20241010_000001"
@@ -10,6 +11,10 @@ branch_labels = None
 depends_on = None
 
 
+def _json_document() -> sa.types.TypeEngine:
+    return sa.JSON().with_variant(JSONB(), "postgresql")
+
+
 def upgrade() -> None:
     asset_status_enum = sa.Enum("queued", "ready", "processing", "failed", name="assetstatus")
     job_status_enum = sa.Enum("queued", "running", "succeeded", "failed", name="jobstatus")
@@ -19,7 +24,7 @@ def upgrade() -> None:
         "organizations",
         sa.Column("org_id", sa.String(length=64), primary_key=True),
         sa.Column("plan", sa.String(length=32), nullable=True),
-        sa.Column("limits_jsonb", sa.JSON(), nullable=True),
+        sa.Column("limits_jsonb", _json_document(), nullable=True),
         sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
 
@@ -69,9 +74,9 @@ def upgrade() -> None:
         sa.Column("org_id", sa.String(length=64), sa.ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False),
         sa.Column("asset_id", sa.String(length=255), sa.ForeignKey("assets.asset_id", ondelete="SET NULL"), nullable=True),
         sa.Column("status", job_status_enum, nullable=False, server_default="queued"),
-        sa.Column("payload", sa.JSON(), nullable=True),
-        sa.Column("result", sa.JSON(), nullable=True),
-        sa.Column("error", sa.JSON(), nullable=True),
+        sa.Column("payload", _json_document(), nullable=True),
+        sa.Column("result", _json_document(), nullable=True),
+        sa.Column("error", _json_document(), nullable=True),
         sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
         sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
         sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
@@ -80,7 +85,10 @@ def upgrade() -> None:
         sa.Column("idempotency_key", sa.String(length=128), nullable=True),
     )
     op.create_index("ix_jobs_org_id_asset_id", "jobs", ["org_id", "asset_id"])
+    op.create_index("ix_jobs_status_type_created", "jobs", ["status", "job_type", "created_at"])
     op.create_unique_constraint("uq_jobs_org_idempotency", "jobs", ["org_id", "idempotency_key"])
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index("ix_jobs_payload_asset", "jobs", [sa.text("(payload->>'asset_id')")])
 
     op.create_table(
         "audit_events",
@@ -88,14 +96,17 @@ def upgrade() -> None:
         sa.Column("org_id", sa.String(length=64), sa.ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False),
         sa.Column("user_id", sa.String(length=128), nullable=True),
         sa.Column("action", sa.String(length=128), nullable=False),
-        sa.Column("meta_jsonb", sa.JSON(), nullable=True),
+        sa.Column("meta_jsonb", _json_document(), nullable=True),
         sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
 
 
 def downgrade() -> None:
     op.drop_table("audit_events")
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_jobs_payload_asset", table_name="jobs")
     op.drop_constraint("uq_jobs_org_idempotency", "jobs", type_="unique")
+    op.drop_index("ix_jobs_status_type_created", table_name="jobs")
     op.drop_index("ix_jobs_org_id_asset_id", table_name="jobs")
     op.drop_table("jobs")
     op.drop_table("thumbnails")
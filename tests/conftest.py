@@ -1,18 +1,31 @@
 import asyncio
+import copy
+import functools
+import json
 import os
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
+from types import SimpleNamespace
 from urllib.parse import urlparse
 
 import jwt
 import pytest
-import subprocess
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-from app.core.config import get_settings
+from app.api.deps import get_app_settings
+from app.core.config import Settings, get_settings
 from app.core.db import Base, create_engine
 from app.core.jobs import get_job_backend
+from app.ingest.asset_id import derive_local_asset_identity
+from app.ingest.ffprobe_parser import SourceContext, parse_ffprobe_json
 from app.main import create_app
 
+MEDIA = Path(__file__).parent / "fixtures" / "media"
+
 
 def pytest_configure(config):
     config.addinivalue_line(
@@ -21,78 +34,168 @@ def pytest_configure(config):
     )
 
 
-@pytest.fixture(autouse=True)
-def configure_environment(request, monkeypatch, tmp_path):
-    if request.node.get_closest_marker("no_default_env"):
-        get_settings.cache_clear()
-        get_job_backend.cache_clear()
-        yield
-        get_job_backend.cache_clear()
-        get_settings.cache_clear()
-        return
-    db_path = tmp_path / "heimdex_test.db"
-    derived_root = tmp_path / "derived"
-
-    monkeypatch.setenv("HEIMDEX_ENV", "test")
-    monkeypatch.setenv("HEIMDEX_LOG_LEVEL", "debug")
-    monkeypatch.setenv("HEIMDEX_DB_URL", f"sqlite+aiosqlite:///{db_path}")
-    monkeypatch.setenv("HEIMDEX_DERIVED_ROOT", str(derived_root))
-    monkeypatch.setenv("HEIMDEX_STORAGE_BACKEND", "local")
-    monkeypatch.setenv("HEIMDEX_JOB_BACKEND", "inline")
-    monkeypatch.setenv("HEIMDEX_REDIS_URL", "redis://localhost:6379/0")
-    monkeypatch.setenv("HEIMDEX_JWT_SECRET", "test-secret")
-    monkeypatch.setenv("HEIMDEX_JWT_ISSUER", "heimdex-test")
-    monkeypatch.setenv("HEIMDEX_JWT_AUDIENCE", "heimdex")
-    monkeypatch.setenv("HEIMDEX_ENABLE_LEGACY", "false")
+_TEST_ENV = {
+    "HEIMDEX_ENV": "test",
+    "HEIMDEX_LOG_LEVEL": "debug",
+    "HEIMDEX_STORAGE_BACKEND": "local",
+    "HEIMDEX_JOB_BACKEND": "inline",
+    "HEIMDEX_REDIS_URL": "redis://localhost:6379/0",
+    "HEIMDEX_JWT_SECRET": "test-secret",
+    "HEIMDEX_JWT_ISSUER": "heimdex-test",
+    "HEIMDEX_JWT_AUDIENCE": "heimdex",
+    "HEIMDEX_ENABLE_LEGACY": "false",
+}
+
+
+_LOOP_KEY = pytest.StashKey[asyncio.AbstractEventLoop]()
+_ENGINE_KEY = pytest.StashKey[AsyncEngine]()
+_SAVED_ENV_KEY = pytest.StashKey[dict]()
+_DERIVED_ROOT_KEY = pytest.StashKey[Path]()
+_SETTINGS_KEY = pytest.StashKey[Settings]()
 
+
+def _is_xdist_controller(config) -> bool:
+    # The xdist controller only distributes tests; its workers run the session hooks themselves.
+    return getattr(config.option, "numprocesses", None) and not hasattr(config, "workerinput")
+
+
+def pytest_sessionstart(session):
+    """Export the test environment and build the schema once, before any test is collected."""
+    config = session.config
+    if _is_xdist_controller(config):
+        return
+    derived_root = Path(tempfile.mkdtemp(prefix="heimdex-derived-"))
+    # Under pytest-xdist each worker process gets its own database.
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    env = {
+        **_TEST_ENV,
+        # Shared-cache in-memory SQLite: the app, worker and session engines all see
+        # one database with no disk I/O, kept alive by the session engine.
+        "HEIMDEX_DB_URL": f"sqlite+aiosqlite:///file:heimdex_test_{worker}?mode=memory&cache=shared&uri=true",
+        "HEIMDEX_DERIVED_ROOT": str(derived_root),
+    }
+    config.stash[_SAVED_ENV_KEY] = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
     get_settings.cache_clear()
     get_job_backend.cache_clear()
+    # Parsed once here (get_settings also applies the HEIMDEX_* aliases and secrets);
+    # the app fixture pins it so requests never re-read the environment.
     settings = get_settings()
+
+    loop = asyncio.new_event_loop()
     engine = create_engine(settings)
 
     async def _setup() -> None:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-    asyncio.run(_setup())
+    loop.run_until_complete(_setup())
+    config.stash[_LOOP_KEY] = loop
+    config.stash[_ENGINE_KEY] = engine
+    config.stash[_DERIVED_ROOT_KEY] = derived_root
+    config.stash[_SETTINGS_KEY] = settings
 
-    yield
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if _ENGINE_KEY not in config.stash:
+        return
+    loop = config.stash[_LOOP_KEY]
+    engine = config.stash[_ENGINE_KEY]
 
     async def _teardown() -> None:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
         await engine.dispose()
 
-    asyncio.run(_teardown())
+    loop.run_until_complete(_teardown())
+    loop.close()
+    shutil.rmtree(config.stash[_DERIVED_ROOT_KEY], ignore_errors=True)
+    for key, value in config.stash[_SAVED_ENV_KEY].items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
     get_job_backend.cache_clear()
     get_settings.cache_clear()
 
 
+@pytest.fixture(scope="session")
+def event_loop(pytestconfig):
+    """The session's event loop, shared by all fixture-side async setup and teardown."""
+    return pytestconfig.stash[_LOOP_KEY]
+
+
+async def _clear_tables(engine) -> None:
+    async with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
+
+
+@pytest.fixture(autouse=True)
+def configure_environment(request):
+    if request.node.get_closest_marker("no_default_env"):
+        yield
+        return
+
+    yield
+
+    # Emptying the tables is far cheaper than rebuilding the schema per test.
+    stash = request.config.stash
+    stash[_LOOP_KEY].run_until_complete(_clear_tables(stash[_ENGINE_KEY]))
+
+
 @pytest.fixture()
-def client(configure_environment):
+def noop_job_backend(monkeypatch):
+    """Record enqueued jobs as succeeded without running them (no ffprobe/ffmpeg)."""
+    monkeypatch.setenv("HEIMDEX_JOB_BACKEND", "noop")
+    get_settings.cache_clear()
+    get_job_backend.cache_clear()
+    yield
+    monkeypatch.undo()
+    get_job_backend.cache_clear()
+    get_settings.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def test_settings(pytestconfig) -> Settings:
+    return pytestconfig.stash[_SETTINGS_KEY]
+
+
+@pytest.fixture(scope="session")
+def app(test_settings):
     app = create_app()
+    app.dependency_overrides[get_settings] = lambda: test_settings
+    app.dependency_overrides[get_app_settings] = lambda: test_settings
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """One app and one lifespan for the session; tables are emptied between tests instead."""
     with TestClient(app) as client:
         yield client
 
 
-def build_token(org_id: str, *, scopes: list[str] | None = None, user_id: str | None = None) -> str:
+@functools.lru_cache(maxsize=None)
+def build_token(org_id: str, *, scopes: tuple[str, ...] | None = None, user_id: str | None = None) -> str:
     payload = {"org_id": org_id}
     if scopes:
-        payload["scopes"] = scopes
+        payload["scopes"] = list(scopes)
     if user_id:
         payload["sub"] = user_id
     return jwt.encode(payload, "test-secret", algorithm="HS256")
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def org_headers() -> dict[str, str]:
     token = build_token("org-test")
     return {"Authorization": f"Bearer {token}"}
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def admin_headers() -> dict[str, str]:
-    token = build_token("org-test", scopes=["admin"])
+    token = build_token("org-test", scopes=("admin",))
     return {"Authorization": f"Bearer {token}"}
 
 
@@ -103,21 +206,117 @@ def uri_to_path(uri: str) -> Path:
     return Path(parsed.path)
 
 
+def stage_upload(src: Path, dst: Path) -> None:
+    """Place ``src`` at ``dst`` without buffering it through Python: hardlink, else copy."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+@pytest.fixture()
+def committed_asset(client, admin_headers, generated_video_file) -> SimpleNamespace:
+    """Run init -> upload -> commit for the generated clip and return its asset id and upload URI."""
+    init_resp = client.post(
+        "/v1/ingest/init",
+        json={
+            "org_id": "org-test",
+            "source_name": "sample.mp4",
+            "content_length": generated_video_file.stat().st_size,
+            "content_type": "video/mp4",
+        },
+        headers=admin_headers,
+    )
+    assert init_resp.status_code == 201, init_resp.text
+    init_json = init_resp.json()
+    upload_uri = init_json["presigned"]["asset_uri"]
+
+    stage_upload(generated_video_file, uri_to_path(upload_uri))
+
+    commit_resp = client.post(
+        "/v1/ingest/commit",
+        json={
+            "org_id": "org-test",
+            "upload_id": init_json["upload_id"],
+            "source_uri": upload_uri,
+            "weak_threshold_bytes": 100_000_000,
+        },
+        headers=admin_headers,
+    )
+    assert commit_resp.status_code == 200, commit_resp.text
+    return SimpleNamespace(asset_id=commit_resp.json()["asset_id"], upload_uri=upload_uri)
+
+
 @pytest.fixture(scope="session")
-def generated_video_file(tmp_path_factory) -> Path:
+def generated_video_file() -> Path:
     """
-    Generates a small, valid MP4 video file for testing in a temporary directory.
+    A small, valid MP4 for tests: 1 second of 128x72 black H.264 at 30 fps.
+
+    Checked in rather than encoded per run; regenerate with
+    ``ffmpeg -f lavfi -i color=c=black:s=128x72:r=30 -t 1 -pix_fmt yuv420p -crf 51 minimal_black.mp4``.
     """
-    video_path = tmp_path_factory.mktemp("data") / "test_video.mp4"
+    return MEDIA / "minimal_black.mp4"
 
-    # Generate a 1-second video with a solid color
+
+# Probe output and parsed sidecars per resolved media path; each file is probed
+# and hashed at most once per session.
+_FFPROBE_CACHE: dict[str, dict] = {}
+_SIDECAR_CACHE: dict[str, dict] = {}
+
+
+def _run_ffprobe(target: Path) -> dict:
     command = [
-        "ffmpeg",
-        "-f", "lavfi",
-        "-i", "color=c=black:s=128x72:r=30",
-        "-t", "1",
-        "-pix_fmt", "yuv420p",
-        str(video_path)
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_format",
+        "-show_streams",
+        "-print_format",
+        "json",
+        str(target),
     ]
-    subprocess.run(command, check=True, capture_output=True)
-    return video_path
+    # stdout stays bytes for json.loads; stderr is kept only for the CalledProcessError message.
+    proc = subprocess.run(command, check=True, capture_output=True)
+    return json.loads(proc.stdout)
+
+
+def _birthtime(stat_result) -> datetime | None:
+    birth = getattr(stat_result, "st_birthtime", None)
+    if birth is not None:
+        return datetime.fromtimestamp(birth, tz=timezone.utc)
+    return None
+
+
+def _cached_ffprobe(media_path: Path) -> dict:
+    key = str(media_path.resolve())
+    if key not in _FFPROBE_CACHE:
+        _FFPROBE_CACHE[key] = _run_ffprobe(media_path)
+    return _FFPROBE_CACHE[key]
+
+
+@pytest.fixture(scope="session")
+def sidecar_for_media():
+    """Return a fresh copy of the parsed sidecar for a media file (probed and hashed once)."""
+
+    def _sidecar(media_path: Path) -> dict:
+        key = str(media_path.resolve())
+        if key not in _SIDECAR_CACHE:
+            identity = derive_local_asset_identity(media_path, max_bytes_for_strong_hash=None)
+            stat = media_path.stat()
+            ctx = SourceContext(
+                type="local",
+                uri=media_path.resolve().as_uri(),
+                filename=media_path.name,
+                size_bytes=stat.st_size,
+                asset_id=identity.asset_id,
+                created_time=_birthtime(stat),
+                modified_time=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                hash=identity.hash,
+                hash_quality=identity.hash_quality,
+            )
+            _SIDECAR_CACHE[key] = parse_ffprobe_json(_cached_ffprobe(media_path), ctx)
+        # render_thumbnails fills in the thumbnails block, so every caller gets its own copy.
+        return copy.deepcopy(_SIDECAR_CACHE[key])
+
+    return _sidecar
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.core.config import get_settings
+from app.legacy import api as legacy_api
 from app.main import create_app
-from tests.conftest import uri_to_path
 
 
 @pytest.fixture()
@@ -40,39 +42,9 @@ def test_admin_env_check_requires_scope(client, org_headers):
     assert resp.status_code == 403
 
 
-def test_ingest_sidecar_flow(client, admin_headers, generated_video_file):
-    # Initialise upload
-    init_resp = client.post(
-        "/v1/ingest/init",
-        json={
-            "org_id": "org-test",
-            "source_name": "sample.mp4",
-            "content_length": generated_video_file.stat().st_size,
-            "content_type": "video/mp4",
-        },
-        headers=admin_headers,
-    )
-    assert init_resp.status_code == 201, init_resp.text
-    init_json = init_resp.json()
-    upload_uri = init_json["presigned"]["asset_uri"]
-
-    target_path = uri_to_path(upload_uri)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    target_path.write_bytes(generated_video_file.read_bytes())
-
-    commit_resp = client.post(
-        "/v1/ingest/commit",
-        json={
-            "org_id": "org-test",
-            "upload_id": init_json["upload_id"],
-            "source_uri": upload_uri,
-            "weak_threshold_bytes": 100_000_000,
-        },
-        headers=admin_headers,
-    )
-    assert commit_resp.status_code == 200, commit_resp.text
-    commit_json = commit_resp.json()
-    asset_id = commit_json["asset_id"]
+def test_ingest_sidecar_flow(client, admin_headers, committed_asset):
+    asset_id = committed_asset.asset_id
+    upload_uri = committed_asset.upload_uri
 
     probe_resp = client.post(
         "/v1/ingest/probe",
@@ -118,32 +90,9 @@ def test_ingest_sidecar_flow(client, admin_headers, generated_video_file):
     assert sidecar_json["asset_id"] == asset_id
 
 
-def test_thumbnail_job_idempotency(client, admin_headers, generated_video_file):
-    init_resp = client.post(
-        "/v1/ingest/init",
-        json={
-            "org_id": "org-test",
-            "source_name": "thumbs.mp4",
-            "content_length": generated_video_file.stat().st_size,
-            "content_type": "video/mp4",
-        },
-        headers=admin_headers,
-    )
-    upload_uri = init_resp.json()["presigned"]["asset_uri"]
-    target_path = uri_to_path(upload_uri)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    target_path.write_bytes(generated_video_file.read_bytes())
-
-    commit_resp = client.post(
-        "/v1/ingest/commit",
-        json={
-            "org_id": "org-test",
-            "upload_id": init_resp.json()["upload_id"],
-            "source_uri": upload_uri,
-        },
-        headers=admin_headers,
-    )
-    asset_id = commit_resp.json()["asset_id"]
+def test_thumbnail_job_idempotency(client, admin_headers, committed_asset, noop_job_backend):
+    asset_id = committed_asset.asset_id
+    upload_uri = committed_asset.upload_uri
 
     key = "thumb-job"
     first_resp = client.post(
@@ -213,6 +162,34 @@ def test_legacy_metadata_can_be_enabled_with_flag(legacy_enabled_client, generat
     assert payload["filename"] == "sample.mp4"
 
 
+def test_legacy_metadata_reuses_probe_for_identical_upload(legacy_enabled_client, monkeypatch):
+    calls = []
+
+    def _fake_ffprobe(target):
+        calls.append(target)
+        return {"format": {"format_name": "mov,mp4", "duration": "1.0", "size": "7"}, "streams": []}
+
+    monkeypatch.setattr(legacy_api, "_run_ffprobe", _fake_ffprobe)
+    monkeypatch.setattr(legacy_api, "_metadata_cache", OrderedDict())
+
+    payload = b"payload"
+    first = legacy_enabled_client.post(
+        "/legacy/metadata", files={"file": ("first.mp4", payload, "video/mp4")}
+    )
+    second = legacy_enabled_client.post(
+        "/legacy/metadata", files={"file": ("second.mp4", payload, "video/mp4")}
+    )
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert len(calls) == 1
+    assert first.json()["filename"] == "first.mp4"
+    assert second.json()["filename"] == "second.mp4"
+    assert second.json()["format_name"] == first.json()["format_name"]
+    # The cached response is copied per hit, never renamed in place.
+    (cached,) = legacy_api._metadata_cache.values()
+    assert cached.filename == "first.mp4"
+
+
 def test_openapi_excludes_legacy_by_default(client):
     resp = client.get("/openapi.json")
     assert resp.status_code == 200
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import stat
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -43,6 +45,20 @@ def test_derive_local_asset_identity_weak(tmp_path: Path):
     assert identity.asset_id.startswith("weak:")
 
 
+def test_derive_local_asset_identity_reuses_stat_result(tmp_path: Path):
+    sample = tmp_path / "large.bin"
+    sample.write_bytes(b"x" * 10)
+    # A stat that disagrees with the file on disk: the identity must come from it, not a fresh stat.
+    fields = list(sample.stat())
+    fields[stat.ST_SIZE] = 12345
+    fields[stat.ST_MTIME] = 1_600_000_000
+    fabricated = os.stat_result(fields)
+
+    identity = derive_local_asset_identity(sample, max_bytes_for_strong_hash=1, stat_result=fabricated)
+    expected = compute_weak_signature(sample.name, 12345, datetime.fromtimestamp(1_600_000_000, tz=timezone.utc))
+    assert identity.asset_id == f"weak:{expected}"
+
+
 def test_compose_drive_asset_identity():
     with_hash = compose_drive_asset_identity("abc123", "md5value")
     assert isinstance(with_hash, AssetIdentity)
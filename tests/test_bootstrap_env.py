@@ -6,9 +6,11 @@ from pathlib import Path
 
 import jwt
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import create_async_engine
 
+from app.api.deps import get_app_settings
 from app.core.config import get_settings
 from app.core.db import Base
 from app.main import create_app
@@ -23,6 +25,7 @@ pytestmark = pytest.mark.no_default_env
 
 def _write_env(target_dir: Path, *, environment: str) -> Path:
     target_dir.mkdir(parents=True, exist_ok=True)
+    # Absolute paths: the app outlives the chdir used to load this file.
     env_text = f"""
 HEIMDEX_ENV={environment}
 HEIMDEX_LOG_LEVEL=debug
@@ -31,9 +34,9 @@ HEIMDEX_JWT_SECRET={DEV_SECRET}
 HEIMDEX_JWT_ISSUER={DEV_ISSUER}
 HEIMDEX_JWT_AUDIENCE={DEV_AUDIENCE}
 HEIMDEX_STORAGE_BACKEND=local
-HEIMDEX_DERIVED_ROOT=derived
+HEIMDEX_DERIVED_ROOT={target_dir / "derived"}
 HEIMDEX_ALLOWED_SOURCE_URI_SCHEMES=file
-HEIMDEX_DB_URL=sqlite+aiosqlite:///./heimdex.db
+HEIMDEX_DB_URL=sqlite+aiosqlite:///{target_dir / "heimdex.db"}
 HEIMDEX_JOB_BACKEND=inline
 HEIMDEX_JOB_MAX_RETRIES=1
 HEIMDEX_REDIS_URL=redis://localhost:6379/0
@@ -51,20 +54,42 @@ async def _initialise_sqlite(database_url: str) -> None:
     await engine.dispose()
 
 
-def _prepare_app(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, *, environment: str) -> TestClient:
-    _write_env(tmp_path, environment=environment)
-    for key in list(os.environ.keys()):
-        if key.startswith("HEIMDEX_"):
-            monkeypatch.delenv(key, raising=False)
-    monkeypatch.chdir(tmp_path)
-    derived = tmp_path / "derived"
-    derived.mkdir(parents=True, exist_ok=True)
-    asyncio.run(_initialise_sqlite("sqlite+aiosqlite:///./heimdex.db"))
+def _prepare_app(target_dir: Path, loop: asyncio.AbstractEventLoop, *, environment: str) -> FastAPI:
+    """Build an app from a generated .env alone, with no HEIMDEX_* variables exported.
+
+    The environment and working directory are only changed while the app is built;
+    the settings it loaded are pinned through dependency overrides so the app keeps
+    them after both are restored.
+    """
+    _write_env(target_dir, environment=environment)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for key in list(os.environ.keys()):
+            if key.startswith("HEIMDEX_"):
+                monkeypatch.delenv(key, raising=False)
+        monkeypatch.chdir(target_dir)
+        (target_dir / "derived").mkdir(parents=True, exist_ok=True)
+        get_settings.cache_clear()
+        settings = get_settings()
+        loop.run_until_complete(_initialise_sqlite(settings.database_url))
+        app = create_app()
     get_settings.cache_clear()
-    app = create_app()
-    client = TestClient(app)
-    client.__enter__()
-    return client
+    app.dependency_overrides[get_settings] = lambda: settings
+    app.dependency_overrides[get_app_settings] = lambda: settings
+    return app
+
+
+@pytest.fixture(scope="module")
+def dev_client(tmp_path_factory, event_loop):
+    app = _prepare_app(tmp_path_factory.mktemp("bootstrap_dev"), event_loop, environment="development")
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def prod_client(tmp_path_factory, event_loop):
+    app = _prepare_app(tmp_path_factory.mktemp("bootstrap_prod"), event_loop, environment="production")
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture(autouse=True)
@@ -74,61 +99,45 @@ def clear_settings_cache():
     get_settings.cache_clear()
 
 
-def test_env_boots_without_shell_exports(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
-    client = _prepare_app(tmp_path, monkeypatch, environment="development")
-    try:
-        response = client.get("/v1/health")
-        assert response.status_code == 200
-        assert response.json()["status"] == "ok"
-    finally:
-        client.close()
-
-
-def test_dev_token_endpoint_only_in_dev(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
-    client = _prepare_app(tmp_path, monkeypatch, environment="development")
-    try:
-        payload = {"org_id": "org-demo", "scopes": ["admin"], "user_id": "user-1"}
-        response = client.post("/v1/admin/dev-token", json=payload)
-        assert response.status_code == 200
-        token = response.json()["token"]
-        decoded = jwt.decode(
-            token,
-            DEV_SECRET,
-            algorithms=["HS256"],
-            audience=DEV_AUDIENCE,
-            issuer=DEV_ISSUER,
-        )
-        assert decoded["org_id"] == payload["org_id"]
-        assert decoded.get("sub") == payload["user_id"]
-    finally:
-        client.close()
-
-    prod_client = _prepare_app(tmp_path / "prod", monkeypatch, environment="production")
-    try:
-        response = prod_client.post("/v1/admin/dev-token", json={"org_id": "org-prod"})
-        assert response.status_code == 403
-    finally:
-        prod_client.close()
-
-
-def test_request_with_dev_token_succeeds(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
-    client = _prepare_app(tmp_path, monkeypatch, environment="development")
+def test_env_boots_without_shell_exports(dev_client):
+    response = dev_client.get("/v1/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+def test_dev_token_endpoint_only_in_dev(dev_client, prod_client):
+    payload = {"org_id": "org-demo", "scopes": ["admin"], "user_id": "user-1"}
+    response = dev_client.post("/v1/admin/dev-token", json=payload)
+    assert response.status_code == 200
+    token = response.json()["token"]
+    decoded = jwt.decode(
+        token,
+        DEV_SECRET,
+        algorithms=["HS256"],
+        audience=DEV_AUDIENCE,
+        issuer=DEV_ISSUER,
+    )
+    assert decoded["org_id"] == payload["org_id"]
+    assert decoded.get("sub") == payload["user_id"]
+
+    response = prod_client.post("/v1/admin/dev-token", json={"org_id": "org-prod"})
+    assert response.status_code == 403
+
+
+def test_request_with_dev_token_succeeds(dev_client, tmp_path: Path):
     media_path = tmp_path / "sample.bin"
     media_path.write_bytes(b"sample-data")
-    try:
-        token_resp = client.post("/v1/admin/dev-token", json={"org_id": "org-demo"})
-        assert token_resp.status_code == 200
-        token = token_resp.json()["token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        commit_resp = client.post(
-            "/v1/ingest/commit",
-            json={
-                "org_id": "org-demo",
-                "upload_id": "upload-1",
-                "source_uri": media_path.resolve().as_uri(),
-            },
-            headers=headers,
-        )
-        assert commit_resp.status_code == 200
-    finally:
-        client.close()
+    token_resp = dev_client.post("/v1/admin/dev-token", json={"org_id": "org-demo"})
+    assert token_resp.status_code == 200
+    token = token_resp.json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    commit_resp = dev_client.post(
+        "/v1/ingest/commit",
+        json={
+            "org_id": "org-demo",
+            "upload_id": "upload-1",
+            "source_uri": media_path.resolve().as_uri(),
+        },
+        headers=headers,
+    )
+    assert commit_resp.status_code == 200
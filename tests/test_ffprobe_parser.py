@@ -11,6 +11,8 @@ from app.ingest.ffprobe_parser import SourceContext, parse_ffprobe_json
 
 FIXTURES = Path("tests/fixtures/ffprobe_json")
 MEDIA = Path("tests/fixtures/media")
+# The parser never mutates its input, so every test can share these dicts.
+_FIXTURES: dict[str, dict] = {path.name: json.loads(path.read_text()) for path in FIXTURES.glob("*.json")}
 
 
 def _iso(dt: datetime) -> str:
@@ -18,29 +20,41 @@ def _iso(dt: datetime) -> str:
 
 
 def _load_fixture(name: str) -> dict:
-    return json.loads((FIXTURES / name).read_text())
+    return _FIXTURES[name]
 
 
-def test_parse_mp4_with_audio():
-    raw = _load_fixture("mp4_h264_aac.json")
-    media_path = MEDIA / "tiny_h264_aac.mp4"
-    identity = derive_local_asset_identity(media_path, max_bytes_for_strong_hash=None)
+def _media_context(name: str) -> SourceContext:
+    media_path = MEDIA / name
     stat = media_path.stat()
-    modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
-
-    ctx = SourceContext(
+    identity = derive_local_asset_identity(media_path, max_bytes_for_strong_hash=None)
+    return SourceContext(
         type="local",
         uri=media_path.resolve().as_uri(),
         filename=media_path.name,
         size_bytes=stat.st_size,
         asset_id=identity.asset_id,
         created_time=None,
-        modified_time=modified,
+        modified_time=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
         hash=identity.hash,
         hash_quality=identity.hash_quality,
     )
 
-    sidecar = parse_ffprobe_json(raw, ctx)
+
+# parse_ffprobe_json only reads its SourceContext, so one instance per file serves the module.
+@pytest.fixture(scope="module")
+def h264_aac_ctx() -> SourceContext:
+    return _media_context("tiny_h264_aac.mp4")
+
+
+@pytest.fixture(scope="module")
+def h264_noaudio_ctx() -> SourceContext:
+    return _media_context("tiny_noaudio.mp4")
+
+
+def test_parse_mp4_with_audio(h264_aac_ctx):
+    raw = _load_fixture("mp4_h264_aac.json")
+
+    sidecar = parse_ffprobe_json(raw, h264_aac_ctx)
 
     assert sidecar["schema_version"] == "0.1.0"
     assert sidecar["format"]["duration_s"] == pytest.approx(2.0)
@@ -48,30 +62,14 @@ def test_parse_mp4_with_audio():
     assert sidecar["audio"]["channels"] == 1
     assert sidecar["thumbnails"]["samples"] == []
     assert sidecar["warnings"] == []
-    assert sidecar["source"]["created_time"] == _iso(modified)
+    assert sidecar["source"]["created_time"] == _iso(h264_aac_ctx.modified_time)
     assert sidecar["source"]["hash"]["algo"] == "sha256"
 
 
-def test_parse_mp4_without_audio():
+def test_parse_mp4_without_audio(h264_noaudio_ctx):
     raw = _load_fixture("mp4_h264_no_audio.json")
-    media_path = MEDIA / "tiny_noaudio.mp4"
-    identity = derive_local_asset_identity(media_path, max_bytes_for_strong_hash=None)
-    stat = media_path.stat()
-    modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
-
-    ctx = SourceContext(
-        type="local",
-        uri=media_path.resolve().as_uri(),
-        filename=media_path.name,
-        size_bytes=stat.st_size,
-        asset_id=identity.asset_id,
-        created_time=None,
-        modified_time=modified,
-        hash=identity.hash,
-        hash_quality=identity.hash_quality,
-    )
 
-    sidecar = parse_ffprobe_json(raw, ctx)
+    sidecar = parse_ffprobe_json(raw, h264_noaudio_ctx)
 
     assert sidecar["audio"] is None
     assert "no_audio_stream" in sidecar["warnings"]
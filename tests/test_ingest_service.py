@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.core.db import create_engine, create_session_factory
+from app.core.storage import get_storage
+from app.ingest.asset_id import derive_local_asset_identity
+from app.services import ingest_service
+from app.services.ingest_service import IngestService
+
+FFPROBE_JSON = json.loads(Path("tests/fixtures/ffprobe_json/mp4_h264_aac.json").read_text())
+
+
+@pytest.fixture()
+def ffprobe_calls(monkeypatch) -> list[Path]:
+    """Stub ffprobe with a fixture payload and record the paths it was run on."""
+    calls: list[Path] = []
+
+    async def _fake_ffprobe(target: Path) -> dict:
+        calls.append(target)
+        return FFPROBE_JSON
+
+    monkeypatch.setattr(IngestService, "_run_ffprobe", staticmethod(_fake_ffprobe))
+    return calls
+
+
+@pytest.fixture()
+def run_service(test_settings, event_loop, ffprobe_calls):
+    """Run a coroutine against a fresh IngestService on the test database, with ffprobe stubbed."""
+    storage = get_storage(test_settings)
+
+    def _run(step):
+        async def _main():
+            engine = create_engine(test_settings)
+            try:
+                async with create_session_factory(engine)() as session:
+                    return await step(IngestService(test_settings, storage, session))
+            finally:
+                await engine.dispose()
+
+        return event_loop.run_until_complete(_main())
+
+    return _run
+
+
+def _twin_files(tmp_path: Path) -> tuple[Path, Path]:
+    """Two files with different content but identical size and mtime."""
+    first = tmp_path / "a.mp4"
+    second = tmp_path / "b.mp4"
+    first.write_bytes(b"a" * 4096)
+    second.write_bytes(b"b" * 4096)
+    stat = first.stat()
+    os.utime(second, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    return first, second
+
+
+def _commit(service: IngestService, path: Path, org_id: str = "org-test", weak_threshold_bytes: int | None = None):
+    return service.commit_upload(
+        org_id=org_id,
+        source_uri=path.as_uri(),
+        upload_id="upload",
+        weak_threshold_bytes=weak_threshold_bytes,
+    )
+
+
+def _probe(path: Path, *, asset_id: str | None = None, weak_threshold_bytes: int | None = None):
+    def _step(service: IngestService):
+        return service.probe(
+            org_id="org-test",
+            source_uri=path.as_uri(),
+            weak_threshold_bytes=weak_threshold_bytes,
+            asset_id=asset_id,
+        )
+
+    return _step
+
+
+def test_probe_reuses_recorded_identity_only_for_the_committed_path(tmp_path: Path, run_service):
+    first, second = _twin_files(tmp_path)
+    committed = run_service(lambda service: _commit(service, first))
+
+    async def _probe(service: IngestService) -> dict:
+        return await service.probe(
+            org_id="org-test",
+            source_uri=second.as_uri(),
+            weak_threshold_bytes=None,
+            asset_id=committed["asset_id"],
+        )
+
+    sidecar = run_service(_probe)
+
+    expected = derive_local_asset_identity(second, max_bytes_for_strong_hash=None)
+    assert sidecar["asset_id"] == expected.asset_id != committed["asset_id"]
+    assert sidecar["source"]["hash"]["value"] == expected.hash.value
+
+
+def test_probe_ignores_recorded_identity_from_another_org(tmp_path: Path, run_service):
+    first, _ = _twin_files(tmp_path)
+    committed = run_service(lambda service: _commit(service, first, org_id="org-other"))
+    # Rewrite the file but keep its size and mtime; only the org check can catch it.
+    stat = first.stat()
+    first.write_bytes(b"c" * 4096)
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    async def _probe(service: IngestService) -> dict:
+        return await service.probe(
+            org_id="org-test",
+            source_uri=first.as_uri(),
+            weak_threshold_bytes=None,
+            asset_id=committed["asset_id"],
+        )
+
+    sidecar = run_service(_probe)
+
+    expected = derive_local_asset_identity(first, max_bytes_for_strong_hash=None)
+    assert sidecar["asset_id"] == expected.asset_id != committed["asset_id"]
+
+
+def test_probe_does_not_cache_an_identity_reused_from_the_asset(tmp_path: Path, run_service):
+    media, _ = _twin_files(tmp_path)
+    committed = run_service(lambda service: _commit(service, media, weak_threshold_bytes=1))
+    assert committed["asset_id"].startswith("weak:")
+
+    # A job probe reuses the weak identity recorded at commit time...
+    job_sidecar = run_service(_probe(media, asset_id=committed["asset_id"]))
+    assert job_sidecar["asset_id"] == committed["asset_id"]
+
+    # ...but a plain probe with no threshold must still derive the strong hash.
+    sidecar = run_service(_probe(media))
+    assert sidecar["asset_id"].startswith("sha256:")
+
+
+def test_probe_cache_hit_skips_ffprobe(tmp_path: Path, run_service, ffprobe_calls):
+    media, _ = _twin_files(tmp_path)
+
+    first = run_service(_probe(media))
+    second = run_service(_probe(media))
+
+    assert second == first
+    assert ffprobe_calls == [media]
+
+
+def test_probe_cache_invalidated_when_file_changes(tmp_path: Path, run_service, ffprobe_calls):
+    media, _ = _twin_files(tmp_path)
+    run_service(_probe(media))
+
+    stat = media.stat()
+    os.utime(media, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    run_service(_probe(media))
+    media.write_bytes(b"a" * 8192)
+    resized = run_service(_probe(media))
+
+    assert len(ffprobe_calls) == 3
+    assert resized["source"]["size_bytes"] == 8192
+
+
+def test_probe_cache_evicts_oldest_entries(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(ingest_service, "PROBE_CACHE_MAX_ENTRIES", 3)
+    cache_dir = tmp_path / ingest_service.PROBE_CACHE_DIRNAME
+    for idx in range(5):
+        entry = cache_dir / f"{idx}.json"
+        ingest_service._write_probe_cache(entry, {"idx": idx})
+        os.utime(entry, ns=(idx * 1_000_000_000, idx * 1_000_000_000))
+
+    ingest_service._write_probe_cache(cache_dir / "5.json", {"idx": 5})
+
+    assert sorted(path.name for path in cache_dir.glob("*.json")) == ["3.json", "4.json", "5.json"]
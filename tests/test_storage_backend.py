@@ -2,17 +2,26 @@ from __future__ import annotations
 
 import pytest
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 from app.core.storage import GCSStorage, LocalStorage, get_storage
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture()
 def clear_settings_cache():
     get_settings.cache_clear()
     yield
     get_settings.cache_clear()
 
 
+@pytest.fixture(scope="module")
+def gcs_storage() -> GCSStorage:
+    # _parse_gs_uri is pure string parsing, so one instance serves every case.
+    storage = get_storage(Settings(storage_backend="gcs"))
+    assert isinstance(storage, GCSStorage)
+    return storage
+
+
+@pytest.mark.usefixtures("clear_settings_cache")
 def test_default_backend_is_local(monkeypatch):
     monkeypatch.delenv("HEIMDEX_STORAGE_BACKEND", raising=False)
     get_settings.cache_clear()
@@ -23,14 +32,13 @@ def test_default_backend_is_local(monkeypatch):
     assert "gs" not in settings.allowed_source_uri_schemes
 
 
-def test_selecting_gcs_returns_gcs_storage(monkeypatch):
-    monkeypatch.setenv("HEIMDEX_STORAGE_BACKEND", "gcs")
-    get_settings.cache_clear()
-    settings = get_settings()
+def test_selecting_gcs_returns_gcs_storage():
+    settings = Settings(storage_backend="gcs")
     storage = get_storage(settings)
     assert isinstance(storage, GCSStorage)
 
 
+@pytest.mark.usefixtures("clear_settings_cache")
 def test_allowed_schemes_reflect_backend(monkeypatch):
     monkeypatch.delenv("HEIMDEX_STORAGE_BACKEND", raising=False)
     monkeypatch.delenv("HEIMDEX_ALLOWED_SOURCE_URI_SCHEMES", raising=False)
@@ -47,31 +55,14 @@ def test_allowed_schemes_reflect_backend(monkeypatch):
     assert "gs" in settings_gcs.allowed_source_uri_schemes
 
 
-def test_parse_gs_uri_success(monkeypatch):
-    monkeypatch.setenv("HEIMDEX_STORAGE_BACKEND", "gcs")
-    get_settings.cache_clear()
-    settings = get_settings()
-    storage = get_storage(settings)
-    assert isinstance(storage, GCSStorage)
-    bucket, key = storage._parse_gs_uri("gs://bucket/a/b/c.mp4")
+def test_parse_gs_uri_success(gcs_storage):
+    bucket, key = gcs_storage._parse_gs_uri("gs://bucket/a/b/c.mp4")
     assert bucket == "bucket"
     assert key == "a/b/c.mp4"
 
 
-@pytest.mark.parametrize(
-    "uri",
-    [
-        "gs:///missing-bucket",
-        "gs://",
-        "gs://bucket",
-        "file:///not-allowed",
-    ],
-)
-def test_parse_gs_uri_errors(monkeypatch, uri):
-    monkeypatch.setenv("HEIMDEX_STORAGE_BACKEND", "gcs")
-    get_settings.cache_clear()
-    settings = get_settings()
-    storage = get_storage(settings)
-    assert isinstance(storage, GCSStorage)
-    with pytest.raises(ValueError):
-        storage._parse_gs_uri(uri)
+def test_parse_gs_uri_errors(gcs_storage):
+    # One table-driven test: the parser is pure, so per-case test nodes only add overhead.
+    for uri in ("gs:///missing-bucket", "gs://", "gs://bucket", "file:///not-allowed"):
+        with pytest.raises(ValueError):
+            gcs_storage._parse_gs_uri(uri)